@@ -1,5 +1,6 @@
 import os
 import socket
+import time
 from pathlib import Path
 
 import typer
@@ -9,13 +10,23 @@ from p2p_file_share.commands.command import Command
 from p2p_file_share.commands.commands import register_command
 from p2p_file_share.commands.models import PreTransferPacket, RequestPacket
 from p2p_file_share.commands.utils.file_chunker import FileChunker
-from p2p_file_share.commands.utils.hash_utils import check_file_integrity, get_file_hash
+from p2p_file_share.commands.utils.hash_utils import StreamingHash, check_file_integrity, get_file_hash
+from p2p_file_share.commands.utils.transfer import (
+    DEFAULT_WINDOW_SIZE,
+    negotiate_window,
+    receive_windowed,
+    send_windowed,
+    sendfile_windowed,
+)
 
 
 @register_command("GET")
 class Get(Command):
     """Retrieve a file from the server."""
 
+    # Whether windowed transfers are sent with zero-copy sendfile instead of reading chunks in python.
+    USE_SENDFILE = hasattr(os, "sendfile")
+
     def execute_server(self, conn: socket.socket, addr):
         """Handle a single client connection in its own thread."""
         request = RequestPacket.unpack(conn.recv(self.RECIEVE_BUFFER_SIZE))
@@ -43,9 +54,25 @@ class Get(Command):
 
     def _send_file(self, conn, addr, request, pre_transfer_packet, file_chunker):
         self.logger.info(f"Starting file transfer to {addr} for file '{request.filename}'")
-        for chunk in file_chunker.get_chunks(start=request.filesize if pre_transfer_packet.continuation else 0):
-            conn.sendall(chunk)
-            conn.recv(len(self.ACK_STRING))  # Wait for ACK
+        start_byte = request.filesize if pre_transfer_packet.continuation else 0
+        started = time.perf_counter()
+        if pre_transfer_packet.window_size and self.USE_SENDFILE:
+            mode = "sendfile"
+            sent = sendfile_windowed(conn, file_chunker.file_path, start_byte, pre_transfer_packet.window_size)
+        elif pre_transfer_packet.window_size:
+            mode = "windowed"
+            chunks = file_chunker.get_chunks(start=start_byte)
+            sent = sum(len(chunk) for chunk in send_windowed(conn, chunks, pre_transfer_packet.window_size))
+        else:
+            mode = "lock-step"
+            sent = 0
+            for chunk in file_chunker.get_chunks(start=start_byte):
+                conn.sendall(chunk)
+                conn.recv(len(self.ACK_STRING))  # Wait for ACK
+                sent += len(chunk)
+        elapsed = time.perf_counter() - started
+        self.logger.info(f"Sent {sent} bytes of '{request.filename}' to {addr} in {elapsed:.3f}s "
+                         f"({sent / max(elapsed, 1e-9) / 1024 ** 2:.2f} MB/s, {mode})")
 
     def _prepare_pre_transfer_packet(self, request: RequestPacket, file_chunker: FileChunker) -> PreTransferPacket:
         requested_file = Path(request.filename)
@@ -61,17 +88,30 @@ class Get(Command):
             continuation=continueation,
             number_of_chunks=file_chunker.get_number_of_chunks(start=start_byte) if exists else 0,
             filehash=get_file_hash(requested_file) if exists else "",
+            filesize=requested_file.stat().st_size if exists else 0,
+            window_size=negotiate_window(request.window_size),
         )
 
-    def execute_client(self, conn: socket.socket, filename: str, outputname: str):
-        """Request a file from the server."""
+    def execute_client(self,
+                       conn: socket.socket,
+                       filename: str,
+                       outputname: str,
+                       window_size: int = DEFAULT_WINDOW_SIZE):
+        """Request a file from the server.
+
+        :param filename: The file to download from the server.
+        :param outputname: The path to save the file to.
+        :param window_size: The largest transfer window to request. 0 for lock-step transfers.
+        """
         output = Path(outputname)
         output = (output / os.path.basename(filename)) if output.is_dir() else output
         self.logger.debug(f'Getting file "{filename}" from {conn} and saving to "{output}"')
+        local_hash = StreamingHash.from_file(output) if output.is_file() else StreamingHash()
         request = RequestPacket(
             filename=filename,
-            filesize=output.stat().st_size if output.is_file() else 0,
-            filehash=get_file_hash(output) if output.is_file() else "",
+            filesize=local_hash.size,
+            filehash=local_hash.hexdigest() if output.is_file() else "",
+            window_size=window_size,
         )
         conn.sendall(request.pack())
         pre_transter_packet = PreTransferPacket.unpack(conn.recv(4096))
@@ -81,33 +121,44 @@ class Get(Command):
                 if typer.confirm("The local file does not match the server's file. Overwrite?", default=True):
                     typer.secho(f"Overwriting {output}.", fg=typer.colors.YELLOW)
                     conn.sendall(self.ACK_STRING)
-                    self._download_file(output, pre_transter_packet, conn)
+                    self._download_file(output, pre_transter_packet, conn, StreamingHash())
                     return
                 else:
                     typer.secho(f'Aborting download of "{output}".', fg=typer.colors.RED)
                     return
             elif pre_transter_packet.continuation:
                 typer.secho(f'Continuing download of "{output}".', fg=typer.colors.YELLOW)
-            self._download_file(output, pre_transter_packet, conn)
+            self._download_file(output, pre_transter_packet, conn, local_hash)
         else:
             typer.secho(f'File "{filename}" does not exist on the server.', fg=typer.colors.RED)
 
     def _download_file(self,
                        output: Path,
                        pre_transter_packet: PreTransferPacket,
-                       sock: socket.socket):
+                       sock: socket.socket,
+                       file_hash: StreamingHash):
         """Download the file from the server.
 
-        :param request: The original request packet.
+        :param output: The path to save the file to.
         :param pre_transter_packet: The pre-transfer packet received from the server.
         :param sock: The connected socket to the server.
+        :param file_hash: The hash of the local file so far. Fed with every recieved chunk.
         """
         with output.open("ab" if pre_transter_packet.continuation else "wb") as f:
-            for _ in tqdm(range(pre_transter_packet.number_of_chunks)):
-                chunk = sock.recv(4096)
-                f.write(chunk)
-                sock.sendall(self.ACK_STRING)  # Send acknowledgment for each chunk
-        if check_file_integrity(output, pre_transter_packet.filehash):
+            if pre_transter_packet.window_size:
+                remaining = pre_transter_packet.filesize - f.tell()
+                with tqdm(total=remaining, unit="B", unit_scale=True) as progress:
+                    for data in receive_windowed(sock, remaining, pre_transter_packet.window_size):
+                        f.write(data)
+                        file_hash.update(data)
+                        progress.update(len(data))
+            else:
+                for _ in tqdm(range(pre_transter_packet.number_of_chunks)):
+                    chunk = sock.recv(4096)
+                    f.write(chunk)
+                    file_hash.update(chunk)
+                    sock.sendall(self.ACK_STRING)  # Send acknowledgment for each chunk
+        if file_hash.matches(pre_transter_packet.filehash):
             typer.secho(f'File "{output}" downloaded successfully.', fg=typer.colors.GREEN)
         else:
             typer.secho(f'File "{output}" downloaded but failed integrity check!', fg=typer.colors.RED)
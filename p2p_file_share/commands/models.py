@@ -1,10 +1,36 @@
 # mypy: ignore-errors
 
 from cstructpy import GenericStruct
-from cstructpy.primitives import BOOL, UINT64, CharArray
+from cstructpy.primitives import BOOL, UINT32, UINT64, CharArray
 
 
-class RequestPacket(GenericStruct):
+class CompatibleStruct(GenericStruct):
+    """A struct that can be unpacked from packets sent by older peers.
+
+    New fields are only ever appended to the end of a packet, so a packet sent by an older peer
+    is a prefix of the current layout. Missing trailing fields are filled with their defaults.
+    """
+
+    @classmethod
+    def unpack(cls, data: bytes):
+        """Unpack the binary data, ignoring trailing fields that are missing from it.
+
+        :param data: The binary data to unpack.
+        :return: An instance of the class with the values found in the data.
+        """
+        offset = 0
+        kwargs = {}
+        temp_instance = cls()
+        for field_name in temp_instance._type_hints:
+            type_instance = getattr(temp_instance, f"_{field_name}_type")
+            if offset + type_instance.size > len(data):
+                break
+            kwargs[field_name] = type_instance.unpack(data[offset:offset + type_instance.size])
+            offset += type_instance.size
+        return cls(**kwargs)
+
+
+class RequestPacket(CompatibleStruct):
     """Packet sent by the client to request a file from the server."""
 
     filename: CharArray(256)
@@ -14,15 +40,25 @@ class RequestPacket(GenericStruct):
     # The SHA256 hash of the file.
     # Specified only if the file exists on the host - for continous downloading. Empty if not.
     filehash: CharArray(64) = ""
+    # The largest transfer window (in bytes) the sender of this packet supports. 0 for lock-step transfers.
+    window_size: UINT32 = 0
 
 
-class PreTransferPacket(GenericStruct):
+class PreTransferPacket(CompatibleStruct):
     """Packet sent by the server to inform the client about the file status."""
 
     exists: BOOL # Whether the file exists on the remote.
     continuation: BOOL # Whether this is a continuation of a previous download.
     number_of_chunks: UINT64 = 0 # Number of chunks the file is divided into. 0 if file does not exist.
     filehash: CharArray(64) = "" # The SHA256 hash of the file. Empty if file does not exist.
+    filesize: UINT64 = 0 # The total size of the file in bytes. 0 if file does not exist.
+    window_size: UINT32 = 0 # The negotiated transfer window in bytes. 0 for lock-step transfers.
+
+
+class WindowAck(GenericStruct):
+    """Cumulative acknowledgement sent by the reciever of a windowed transfer."""
+
+    received: UINT64 = 0 # The total number of bytes recieved so far.
 
 
 class FileEntry(GenericStruct):
@@ -31,4 +67,3 @@ class FileEntry(GenericStruct):
     filename: CharArray(256)  # The name of the file.
     filesize: UINT64 # The size of the file in bytes
     is_dir: BOOL # Whether the entry is a directory.
-
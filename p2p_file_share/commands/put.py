@@ -1,7 +1,7 @@
 import os
 import socket
 from pathlib import Path
-from typing import Generator, Optional
+from typing import Iterable, Optional
 
 import typer
 from tqdm import tqdm
@@ -10,7 +10,13 @@ from p2p_file_share.commands.command import Command
 from p2p_file_share.commands.commands import register_command
 from p2p_file_share.commands.models import PreTransferPacket, RequestPacket
 from p2p_file_share.commands.utils.file_chunker import FileChunker
-from p2p_file_share.commands.utils.hash_utils import check_file_integrity, get_file_hash
+from p2p_file_share.commands.utils.hash_utils import StreamingHash, check_file_integrity, get_file_hash
+from p2p_file_share.commands.utils.transfer import (
+    DEFAULT_WINDOW_SIZE,
+    negotiate_window,
+    receive_windowed,
+    send_windowed,
+)
 
 
 @register_command("PUT")
@@ -25,21 +31,34 @@ class Put(Command):
             conn.sendall(self.ERR_STRING)
             return
         try:
+            existing = upload_destination.is_file()
+            existing_hash = StreamingHash.from_file(upload_destination) if existing else StreamingHash()
             request = RequestPacket(
                 filename=str(upload_destination),
-                filesize=upload_destination.stat().st_size if upload_destination.is_file() else 0,
-                filehash=get_file_hash(upload_destination) if upload_destination.is_file() else "",
+                filesize=existing_hash.size,
+                filehash=existing_hash.hexdigest() if existing else "",
+                window_size=DEFAULT_WINDOW_SIZE,
             )
             self.logger.info(f"Sending a request packet: {request}")
             conn.sendall(request.pack())
             pre_transfer_packet = PreTransferPacket.unpack(conn.recv(self.RECIEVE_BUFFER_SIZE))
             self.logger.info(f"Got a pre-transfer packet: {pre_transfer_packet}")
-            self._recieve_upload(conn, upload_destination, pre_transfer_packet)
+            file_hash = existing_hash if pre_transfer_packet.continuation else StreamingHash()
+            self._recieve_upload(conn, upload_destination, pre_transfer_packet, file_hash)
         finally:
             os.remove(lock_file)
 
-    def execute_client(self, conn: socket.socket, filename: str, destination: str):
-        """Upload a file to the server."""
+    def execute_client(self,
+                       conn: socket.socket,
+                       filename: str,
+                       destination: str,
+                       window_size: int = DEFAULT_WINDOW_SIZE):
+        """Upload a file to the server.
+
+        :param filename: The local file to upload.
+        :param destination: The path on the server to upload the file to.
+        :param window_size: The largest transfer window to use. 0 for lock-step transfers.
+        """
         file_path = Path(filename)
         if not file_path.is_file():
             typer.secho(f"{file_path} is not a file.", fg=typer.colors.RED)
@@ -62,23 +81,32 @@ class Put(Command):
             continuation=continueation,
             number_of_chunks=file_chunker.get_number_of_chunks(start=start_byte),
             filehash=get_file_hash(file_path),
+            filesize=file_path.stat().st_size,
+            window_size=negotiate_window(response.window_size, window_size),
         )
         conn.sendall(pre_transfer_packet.pack())
         if continueation:
             typer.secho("Continueing an older uplaod...", fg=typer.colors.GREEN)
-        self._upload_file(conn, file_chunker.get_chunks(start=start_byte))
+        self._upload_file(conn, file_chunker.get_chunks(start=start_byte), pre_transfer_packet)
 
     def _upload_file(self,
                     conn: socket.socket,
-                    chunks: Generator) -> None:
+                    chunks: Iterable[bytes],
+                    pre_transfer_packet: PreTransferPacket) -> None:
         """Upload the file from the server.
 
         :param conn: The connected socket to the server.
         :param chunks: The generator created by the file chuker that generated the chunks to send.
+        :param pre_transfer_packet: The pre-transfer packet sent to the server.
         """
-        for chunk in tqdm(list(chunks)):
-            conn.sendall(chunk)
-            conn.recv(len(self.ACK_STRING))
+        if pre_transfer_packet.window_size:
+            for _ in tqdm(send_windowed(conn, chunks, pre_transfer_packet.window_size),
+                          total=pre_transfer_packet.number_of_chunks):
+                pass
+        else:
+            for chunk in tqdm(list(chunks)):
+                conn.sendall(chunk)
+                conn.recv(len(self.ACK_STRING))
         hash_result = conn.recv(len(self.ACK_STRING))
         if hash_result == self.ACK_STRING:
             typer.secho("File uploaded successfully.", fg=typer.colors.GREEN)
@@ -109,17 +137,30 @@ class Put(Command):
             return None
         return lock_file
 
-    def _recieve_upload(self, conn, upload_destination: Path, pre_transfer_packet: PreTransferPacket) -> None:
-        """Recieve the upload from the client."""
+    def _recieve_upload(self,
+                        conn,
+                        upload_destination: Path,
+                        pre_transfer_packet: PreTransferPacket,
+                        file_hash: StreamingHash) -> None:
+        """Recieve the upload from the client.
+
+        :param file_hash: The hash of the destination file so far. Fed with every recieved chunk.
+        """
         if pre_transfer_packet.continuation:
             self.logger.info("Continueing an older upload...")
         with open(upload_destination, "ab" if pre_transfer_packet.continuation else "wb") as f:
-            for _ in range(pre_transfer_packet.number_of_chunks):
-                f.write(conn.recv(self.RECIEVE_BUFFER_SIZE))
-                conn.send(self.ACK_STRING)
-        conn.send(self.ACK_STRING
-                    if check_file_integrity(upload_destination, pre_transfer_packet.filehash)
-                    else self.ERR_STRING)
+            if pre_transfer_packet.window_size:
+                remaining = pre_transfer_packet.filesize - f.tell()
+                for data in receive_windowed(conn, remaining, pre_transfer_packet.window_size):
+                    f.write(data)
+                    file_hash.update(data)
+            else:
+                for _ in range(pre_transfer_packet.number_of_chunks):
+                    chunk = conn.recv(self.RECIEVE_BUFFER_SIZE)
+                    f.write(chunk)
+                    file_hash.update(chunk)
+                    conn.send(self.ACK_STRING)
+        conn.send(self.ACK_STRING if file_hash.matches(pre_transfer_packet.filehash) else self.ERR_STRING)
 
     @classmethod
     def help(cls) -> str:
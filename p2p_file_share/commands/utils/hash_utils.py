@@ -1,5 +1,80 @@
 import hashlib
 from pathlib import Path
+from typing import Optional
+
+HASH_BUFFER_SIZE = 1024 * 1024  # 1MB
+
+
+class StreamingHash:
+    """An incremental SHA256 hash that can be fed as data streams by.
+
+    Used by the transfer loops to hash recieved chunks on the fly,
+    so verifying a transfer doesn't require re-reading the file from disk.
+    """
+
+    def __init__(self):
+        """Initialize an empty SHA256 hash."""
+        self._hash = hashlib.sha256()
+        self.size = 0
+
+    @classmethod
+    def from_file(cls, path: Path, start: int = 0, end: Optional[int] = None) -> "StreamingHash":
+        """Create a hash seeded with the contents of a file.
+
+        :param path: The file to hash.
+        :param start: The byte offset to start reading from. Default is 0.
+        :param end: The byte offset to stop reading at. Default is None (read to end of file).
+        :return: The seeded hash, which can be fed more data afterwards.
+        """
+        streaming_hash = cls()
+        streaming_hash.update_from_file(path, start, end)
+        return streaming_hash
+
+    def update(self, data: bytes | bytearray | memoryview) -> None:
+        """Feed more data into the hash.
+
+        :param data: The data to feed.
+        """
+        self._hash.update(data)
+        self.size += len(data)
+
+    def update_from_file(self, path: Path, start: int = 0, end: Optional[int] = None) -> None:
+        """Feed a byte range of a file into the hash, using a fixed-size reusable buffer.
+
+        :param path: The file to hash.
+        :param start: The byte offset to start reading from. Default is 0.
+        :param end: The byte offset to stop reading at. Default is None (read to end of file).
+        """
+        buffer = memoryview(bytearray(HASH_BUFFER_SIZE))
+        remaining = None if end is None else max(end - start, 0)
+        with path.open("rb", buffering=0) as f:
+            f.seek(start)
+            while remaining is None or remaining > 0:
+                view = buffer if remaining is None or remaining >= len(buffer) else buffer[:remaining]
+                read = f.readinto(view)
+                if not read:
+                    break
+                self.update(view[:read])
+                if remaining is not None:
+                    remaining -= read
+
+    def copy(self) -> "StreamingHash":
+        """Return an independent copy of the hash state."""
+        clone = StreamingHash()
+        clone._hash = self._hash.copy()
+        clone.size = self.size
+        return clone
+
+    def hexdigest(self) -> str:
+        """Return the SHA256 hash of the data fed so far as a hexadecimal string."""
+        return self._hash.hexdigest()
+
+    def matches(self, file_hash: str) -> bool:
+        """Check whether the data fed so far matches the expected hash.
+
+        :param file_hash: The expected SHA256 hash.
+        """
+        return self.hexdigest() == file_hash
 
 
 def get_file_hash(path: Path) -> str:
@@ -7,9 +82,7 @@ def get_file_hash(path: Path) -> str:
 
     :return: The SHA256 hash of the file as a hexadecimal string.
     """
-    with path.open("rb") as f:
-        data = f.read()
-    return hashlib.sha256(data).hexdigest()
+    return StreamingHash.from_file(path).hexdigest()
 
 
 def check_file_integrity(path: Path, file_hash: str, start=0, end=None) -> bool:
@@ -20,8 +93,4 @@ def check_file_integrity(path: Path, file_hash: str, start=0, end=None) -> bool:
     :param end: The byte offset to stop reading at. Default is None (read to end of file).
     :return: True if the file's hash matches the expected hash, False otherwise.
     """
-    with path.open("rb") as f:
-        f.seek(start)
-        partial_file_data = f.read(end)
-    partial_file_hash = hashlib.sha256(partial_file_data).hexdigest()
-    return partial_file_hash == file_hash
+    return StreamingHash.from_file(path, start, end).matches(file_hash)
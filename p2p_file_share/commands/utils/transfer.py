@@ -0,0 +1,112 @@
+import os
+import socket
+from pathlib import Path
+from typing import Generator, Iterable
+
+from p2p_file_share.commands.models import WindowAck
+
+DEFAULT_WINDOW_SIZE = 256 * 1024  # 256KB in flight
+RECIEVE_BUFFER_SIZE = 64 * 1024
+WINDOW_ACK_SIZE = len(WindowAck().pack())
+
+
+def recv_exact(conn: socket.socket, size: int) -> bytes:
+    """Recieve exactly `size` bytes from the socket.
+
+    :param conn: The connected socket.
+    :param size: The number of bytes to recieve.
+    :return: The recieved bytes.
+    """
+    buffer = bytearray()
+    while len(buffer) < size:
+        data = conn.recv(size - len(buffer))
+        if not data:
+            raise ConnectionError(f"Connection closed after {len(buffer)} of {size} bytes")
+        buffer += data
+    return bytes(buffer)
+
+
+def negotiate_window(requested: int, supported: int = DEFAULT_WINDOW_SIZE) -> int:
+    """Choose the transfer window both peers support.
+
+    :param requested: The window size the peer asked for. 0 if the peer only supports lock-step transfers.
+    :param supported: The largest window size supported locally. 0 to force lock-step transfers.
+    :return: The negotiated window size, 0 for lock-step transfers.
+    """
+    return min(requested, supported)
+
+
+def send_windowed(conn: socket.socket, chunks: Iterable[bytes], window_size: int) -> Generator[bytes, None, None]:
+    """Send chunks while keeping up to `window_size` unacknowledged bytes in flight.
+
+    Yields every chunk once it was sent so callers can track progress.
+    Returns only after the reciever acknowledged every byte.
+
+    :param conn: The connected socket.
+    :param chunks: The chunks to send.
+    :param window_size: The negotiated window size in bytes.
+    """
+    sent = acknowledged = 0
+    for chunk in chunks:
+        while sent - acknowledged >= window_size:
+            acknowledged = _recv_ack(conn)
+        conn.sendall(chunk)
+        sent += len(chunk)
+        yield chunk
+    while acknowledged < sent:
+        acknowledged = _recv_ack(conn)
+
+
+def sendfile_windowed(conn: socket.socket, file_path: Path, start: int, window_size: int) -> int:
+    """Send a file from `start` to its end using zero-copy `sendfile` while respecting the transfer window.
+
+    The reciever's cumulative acknowledgements are consumed between segments,
+    so it's wire-compatible with `send_windowed`.
+
+    :param conn: The connected socket.
+    :param file_path: The file to send.
+    :param start: The byte offset to start sending from.
+    :param window_size: The negotiated window size in bytes.
+    :return: The number of bytes sent.
+    """
+    sent = acknowledged = 0
+    with file_path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size - start
+        while sent < size:
+            while sent - acknowledged >= window_size:
+                acknowledged = _recv_ack(conn)
+            count = min(window_size - (sent - acknowledged), size - sent)
+            segment = conn.sendfile(f, offset=start + sent, count=count)
+            if not segment:
+                raise ConnectionError(f"File '{file_path}' was truncated after {start + sent} bytes")
+            sent += segment
+    while acknowledged < sent:
+        acknowledged = _recv_ack(conn)
+    return sent
+
+
+def receive_windowed(conn: socket.socket, size: int, window_size: int) -> Generator[bytes, None, None]:
+    """Recieve `size` bytes of a windowed transfer, sending cumulative acknowledgements.
+
+    An acknowledgement is sent whenever half a window was recieved, and once the transfer completes.
+
+    :param conn: The connected socket.
+    :param size: The number of bytes to recieve.
+    :param window_size: The negotiated window size in bytes.
+    """
+    received = last_acknowledged = 0
+    ack_threshold = max(1, window_size // 2)
+    while received < size:
+        data = conn.recv(min(RECIEVE_BUFFER_SIZE, size - received))
+        if not data:
+            raise ConnectionError(f"Connection closed after {received} of {size} bytes")
+        received += len(data)
+        if received - last_acknowledged >= ack_threshold or received == size:
+            conn.sendall(WindowAck(received=received).pack())
+            last_acknowledged = received
+        yield data
+
+
+def _recv_ack(conn: socket.socket) -> int:
+    """Wait for the next cumulative acknowledgement and return the number of bytes it covers."""
+    return WindowAck.unpack(recv_exact(conn, WINDOW_ACK_SIZE)).received
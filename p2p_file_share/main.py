@@ -5,6 +5,7 @@ import click
 
 from p2p_file_share.client.cli import CLI
 from p2p_file_share.client.client import Client
+from p2p_file_share.commands.utils.transfer import DEFAULT_WINDOW_SIZE
 from p2p_file_share.log import setup_logger
 from p2p_file_share.server.server import Server
 
@@ -18,6 +19,12 @@ LOG_LEVEL_OPTION = click.option(
 )
 PORT_OPTION = click.option("--port", "-p", type=int, default=DEFAULT_PORT, help="The port to listen on.")
 HOST_OPTION = click.option("--host", "-h", type=str, required=True, help="The host to connect to.")
+WINDOW_SIZE_OPTION = click.option(
+    "--window-size",
+    type=click.IntRange(min=0),
+    default=DEFAULT_WINDOW_SIZE,
+    help="Bytes to keep in flight during a transfer. 0 for lock-step transfers."
+)
 
 
 @click.group()
@@ -40,12 +47,14 @@ def start(port: int, log_level: str):
 @PORT_OPTION
 @click.argument("filename", type=str)
 @click.argument("output", required=False, type=str)
+@WINDOW_SIZE_OPTION
 @LOG_LEVEL_OPTION
-def get(filename:str, output: str, host: str, port: int, log_level: str):
+def get(filename:str, output: str, host: str, port: int, window_size: int, log_level: str):
     """Get a file from a peer."""
     output = output or os.path.basename(filename)
     print(f'Starting client to get file "{filename}" from {host}:{port} and save to "{output}"...')
-    Client(host, port, getattr(logging, log_level.upper())).execute_command("get", filename, output)
+    Client(host, port, getattr(logging, log_level.upper())).execute_command("get", filename, output,
+                                                                            window_size=window_size)
 
 
 @main.command(help="Upload a file to a peer.")
@@ -53,12 +62,14 @@ def get(filename:str, output: str, host: str, port: int, log_level: str):
 @PORT_OPTION
 @click.argument("filename", type=str)
 @click.argument("destination", required=False, type=str)
+@WINDOW_SIZE_OPTION
 @LOG_LEVEL_OPTION
-def put(filename:str, destination: str, host: str, port: int, log_level: str):
+def put(filename:str, destination: str, host: str, port: int, window_size: int, log_level: str):
     """Get a file from a peer."""
     destination = destination or os.path.basename(filename)
     print(f'Starting client to upload a file "{filename}" to {host}:{port} and save to "{destination}"...')
-    Client(host, port, getattr(logging, log_level.upper())).execute_command("put", filename, destination)
+    Client(host, port, getattr(logging, log_level.upper())).execute_command("put", filename, destination,
+                                                                            window_size=window_size)
 
 
 @main.command(help="Start a shell to interact with a peer.")
@@ -35,13 +35,13 @@ def _wait_for_server(host: str, port: int, timeout: float = 5.0) -> None:
     raise TimeoutError("Server did not start in time")
 
 
-def _run_with_retry(client: Client, command: str, *args, timeout: float = 5.0) -> None:
+def _run_with_retry(client: Client, command: str, *args, timeout: float = 5.0, **kwargs) -> None:
     """Retry client commands until the server begins accepting connections."""
     deadline = time.monotonic() + timeout
     last_error: Exception | None = None
     while time.monotonic() < deadline:
         try:
-            return client.execute_command(command, *args)
+            return client.execute_command(command, *args, **kwargs)
         except ConnectionRefusedError as exc:
             last_error = exc
             time.sleep(0.05)
@@ -50,15 +50,30 @@ def _run_with_retry(client: Client, command: str, *args, timeout: float = 5.0) -
     raise TimeoutError(f"Command '{command}' could not reach the server")
 
 
+class _SilentProgress:
+    """A pass-through stand-in for tqdm supporting both iterable and manual progress bars."""
+
+    def __init__(self, iterable=None, *args, **kwargs):
+        self.iterable = iterable
+
+    def __iter__(self):
+        return iter(self.iterable)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def update(self, n=1):
+        pass
+
+
 @pytest.fixture(autouse=True)
 def disable_tqdm(monkeypatch) -> None:
     """Replace progress bars with pass-through iterables for faster, quieter tests."""
-
-    def _passthrough(iterable, *args, **kwargs):
-        return iterable
-
-    monkeypatch.setattr("p2p_file_share.commands.put.tqdm", _passthrough)
-    monkeypatch.setattr("p2p_file_share.commands.get.tqdm", _passthrough)
+    monkeypatch.setattr("p2p_file_share.commands.put.tqdm", _SilentProgress)
+    monkeypatch.setattr("p2p_file_share.commands.get.tqdm", _SilentProgress)
 
 
 @pytest.fixture
@@ -80,7 +95,7 @@ def running_server() -> Generator[Tuple[str, int], None, None]:
 def run_with_retry() -> Callable[[Client, str, List[Any]], Any]:
     """Expose the retry helper to tests via a fixture."""
 
-    def _runner(client: Client, command: str, *args, timeout: float = 5.0) -> None:
-        return _run_with_retry(client, command, *args, timeout=timeout)
+    def _runner(client: Client, command: str, *args, timeout: float = 5.0, **kwargs) -> None:
+        return _run_with_retry(client, command, *args, timeout=timeout, **kwargs)
 
     return _runner
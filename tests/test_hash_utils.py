@@ -1,7 +1,7 @@
 import hashlib
 from pathlib import Path
 
-from p2p_file_share.commands.utils.hash_utils import check_file_integrity, get_file_hash
+from p2p_file_share.commands.utils.hash_utils import StreamingHash, check_file_integrity, get_file_hash
 
 
 def test_get_file_hash_matches_sha256(tmp_path: Path) -> None:
@@ -37,3 +37,33 @@ def test_check_file_integrity_with_offset(tmp_path: Path) -> None:
     expected_hash = hashlib.sha256(data[start:]).hexdigest()
 
     assert check_file_integrity(file_path, expected_hash, start=start)
+
+
+def test_streaming_hash_matches_file_hash_across_buffers(tmp_path: Path, monkeypatch) -> None:
+    """Feeding chunks incrementally should produce the same digest as hashing the file in fixed buffers."""
+    monkeypatch.setattr("p2p_file_share.commands.utils.hash_utils.HASH_BUFFER_SIZE", 7)
+    file_path = tmp_path / "streamed.bin"
+    data = bytes(range(256)) * 3
+    file_path.write_bytes(data)
+
+    streaming_hash = StreamingHash()
+    for i in range(0, len(data), 100):
+        streaming_hash.update(data[i:i + 100])
+
+    assert streaming_hash.hexdigest() == get_file_hash(file_path) == hashlib.sha256(data).hexdigest()
+    assert streaming_hash.size == len(data)
+
+
+def test_streaming_hash_seeded_from_prefix_can_continue(tmp_path: Path) -> None:
+    """A hash seeded from a partial file should continue with the remaining data, leaving copies untouched."""
+    file_path = tmp_path / "partial.bin"
+    data = b"resumable download payload"
+    file_path.write_bytes(data)
+
+    prefix_hash = StreamingHash.from_file(file_path, end=10)
+    assert prefix_hash.matches(hashlib.sha256(data[:10]).hexdigest())
+
+    full_hash = prefix_hash.copy()
+    full_hash.update(data[10:])
+    assert full_hash.matches(hashlib.sha256(data).hexdigest())
+    assert prefix_hash.size == 10
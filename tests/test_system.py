@@ -1,8 +1,10 @@
 import logging
+import os
 from pathlib import Path
 from typing import Any, Callable, Tuple, Unpack
 
 from p2p_file_share.client.client import Client
+from p2p_file_share.commands.get import Get
 
 
 def test_put_uploads_file_to_server(tmp_path: Path,
@@ -58,3 +60,56 @@ def test_get_downloads_file_from_server(tmp_path: Path,
 
     assert local_target.exists()
     assert local_target.read_bytes() == contents
+
+
+def test_transfers_in_windowed_and_lock_step_modes(tmp_path: Path,
+                                                   running_server: Tuple[str, int],
+                                                   run_with_retry: Callable[[Client, str, Unpack[Any]], Any]):
+    """System tests for the entire application.
+
+    Uploads and downloads a multi-chunk file with a transfer window and in lock-step mode.
+    Checks that both modes reconstruct the file.
+
+    :param tmp_path: A temporary folder for storing the transferred files.
+    :param running_server: A tuple of the host and port of the running server.
+    :param run_with_retry: A helper func to run a command with a retry mechanism.
+    """
+    payload = os.urandom(200_000)
+    source = tmp_path / "source.bin"
+    source.write_bytes(payload)
+
+    client = Client(*running_server, logging_level=logging.WARNING)
+    for window_size in (16 * 1024, 0):
+        uploaded = tmp_path / f"uploaded-{window_size}.bin"
+        downloaded = tmp_path / f"downloaded-{window_size}.bin"
+        run_with_retry(client, "put", str(source), str(uploaded), window_size=window_size)
+        run_with_retry(client, "get", str(uploaded), str(downloaded), window_size=window_size)
+
+        assert uploaded.read_bytes() == payload
+        assert downloaded.read_bytes() == payload
+
+
+def test_get_falls_back_to_chunked_sending_without_sendfile(tmp_path: Path,
+                                                            monkeypatch,
+                                                            running_server: Tuple[str, int],
+                                                            run_with_retry: Callable[[Client, str, Unpack[Any]], Any]):
+    """System tests for the entire application.
+
+    Disables the zero-copy sendfile path and downloads a multi-chunk file.
+    Checks that the chunked fallback reconstructs the file.
+
+    :param tmp_path: A temporary folder for storing the transferred files.
+    :param monkeypatch: Used to disable the sendfile path on the server.
+    :param running_server: A tuple of the host and port of the running server.
+    :param run_with_retry: A helper func to run a command with a retry mechanism.
+    """
+    monkeypatch.setattr(Get, "USE_SENDFILE", False)
+    payload = os.urandom(50_000)
+    remote_file = tmp_path / "remote.bin"
+    remote_file.write_bytes(payload)
+    local_target = tmp_path / "local.bin"
+
+    client = Client(*running_server, logging_level=logging.WARNING)
+    run_with_retry(client, "get", str(remote_file), str(local_target))
+
+    assert local_target.read_bytes() == payload
@@ -0,0 +1,82 @@
+import os
+import socket
+import threading
+
+from p2p_file_share.commands.models import PreTransferPacket, RequestPacket
+from p2p_file_share.commands.utils.transfer import (
+    negotiate_window,
+    receive_windowed,
+    send_windowed,
+    sendfile_windowed,
+)
+
+
+def _run_windowed_transfer(payload: bytes, chunk_size: int, window_size: int) -> bytes:
+    """Send the payload over a socket pair using the windowed transfer helpers."""
+    sender, reciever = socket.socketpair()
+    chunks = [payload[i:i + chunk_size] for i in range(0, len(payload), chunk_size)]
+    thread = threading.Thread(target=lambda: list(send_windowed(sender, chunks, window_size)))
+    thread.start()
+    try:
+        return b"".join(receive_windowed(reciever, len(payload), window_size))
+    finally:
+        thread.join(timeout=5)
+        sender.close()
+        reciever.close()
+
+
+def test_windowed_transfer_reconstructs_payload() -> None:
+    """Every byte should arrive in order while multiple chunks are in flight."""
+    payload = os.urandom(300_000)
+
+    assert _run_windowed_transfer(payload, chunk_size=1024, window_size=16 * 1024) == payload
+
+
+def test_windowed_transfer_with_window_smaller_than_chunk() -> None:
+    """A window smaller than a single chunk should degrade gracefully instead of deadlocking."""
+    payload = os.urandom(10_000)
+
+    assert _run_windowed_transfer(payload, chunk_size=4096, window_size=100) == payload
+
+
+def test_negotiate_window_falls_back_to_lock_step() -> None:
+    """Peers that don't advertise a window should get a lock-step transfer."""
+    assert negotiate_window(0) == 0
+    assert negotiate_window(4096, supported=0) == 0
+    assert negotiate_window(4096, supported=8192) == 4096
+
+
+def test_packets_from_older_peers_unpack_with_defaults() -> None:
+    """Packets missing the newer trailing fields should unpack with their default values."""
+    legacy_request = RequestPacket(filename="file.bin", filesize=5, filehash="a" * 64).pack()[:-4]
+    request = RequestPacket.unpack(legacy_request)
+    assert request.filename == "file.bin"
+    assert request.filesize == 5
+    assert request.window_size == 0
+
+    legacy_pre_transfer = PreTransferPacket(exists=True, continuation=False, number_of_chunks=3).pack()[:74]
+    pre_transfer_packet = PreTransferPacket.unpack(legacy_pre_transfer)
+    assert pre_transfer_packet.number_of_chunks == 3
+    assert pre_transfer_packet.window_size == 0
+
+
+def test_sendfile_windowed_sends_file_from_offset(tmp_path) -> None:
+    """The zero-copy sender should be wire-compatible with the windowed reciever and honor the start offset."""
+    payload = os.urandom(100_000)
+    file_path = tmp_path / "sendfile.bin"
+    file_path.write_bytes(payload)
+    start = 12_345
+
+    sender, reciever = socket.socketpair()
+    result = {}
+    thread = threading.Thread(target=lambda: result.update(sent=sendfile_windowed(sender, file_path, start, 8192)))
+    thread.start()
+    try:
+        received = b"".join(receive_windowed(reciever, len(payload) - start, 8192))
+    finally:
+        thread.join(timeout=5)
+        sender.close()
+        reciever.close()
+
+    assert received == payload[start:]
+    assert result["sent"] == len(payload) - start